@@ -6,7 +6,7 @@ from setuptools import setup, find_packages
 INSTALL_REQUIRES = [
     "PyMuPDF>=1.23.14",
     "fonttools>=4.47.0",
-    "lxml>=4.9.3",
+    "lxml>=5.0.0",
     "googletrans==4.0.0-rc1",
     # CORRECTION : Dépendances critiques restaurées
     "reportlab>=4.0.7",
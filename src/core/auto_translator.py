@@ -5,6 +5,7 @@ PDF Layout Translator - Module de Traduction Automatique
 Utilise des services externes pour traduire le contenu d'un fichier XLIFF.
 """
 import logging
+from typing import Union
 from lxml import etree
 from time import sleep
 
@@ -26,14 +27,16 @@ class AutoTranslator:
     def is_available(self) -> bool:
         return GOOGLETRANS_AVAILABLE
 
-    def translate_xliff_content(self, xliff_content: str, target_lang: str) -> str:
+    def translate_xliff_content(self, xliff_content: Union[str, bytes], target_lang: str) -> str:
         if not self.is_available():
             raise RuntimeError("La bibliothèque 'googletrans' n'est pas installée.")
 
         self.debug_logger.info("--- Début de la Traduction Automatique ---")
         
         parser = etree.XMLParser(remove_blank_text=True)
-        root = etree.fromstring(xliff_content.encode('utf-8'), parser)
+        if isinstance(xliff_content, str):
+            xliff_content = xliff_content.encode('utf-8')
+        root = etree.fromstring(xliff_content, parser)
         
         ns = {'xliff': 'urn:oasis:names:tc:xliff:document:1.2'}
         trans_units = root.xpath("//xliff:trans-unit", namespaces=ns)
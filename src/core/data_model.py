@@ -4,10 +4,17 @@
 PDF Layout Translator - Modèle de Données
 *** VERSION FINALE ET STABILISÉE v1.3 ***
 """
+import sys
 from dataclasses import dataclass, field
 from typing import List, Tuple, Optional
 
-@dataclass
+# Objets du DOM créés par milliers (un TextSpan par mot après la mise en page) : __slots__ générés
+# par dataclass dès Python 3.10, sans __dict__ par instance. Sans effet sur les versions antérieures.
+# Chaque classe fournit to_dict() : même résultat que dataclasses.asdict() (mêmes clés, dans l'ordre
+# des champs) sans sa copie profonde récursive. Toute modification des champs doit y être reportée.
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class FontInfo:
     name: str
     size: float
@@ -15,7 +22,10 @@ class FontInfo:
     is_bold: bool
     is_italic: bool
 
-@dataclass
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'size': self.size, 'color': self.color, 'is_bold': self.is_bold, 'is_italic': self.is_italic}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class TextSpan:
     id: str
     text: str
@@ -25,7 +35,11 @@ class TextSpan:
     forces_line_break: bool = False
     final_bbox: Optional[Tuple[float, float, float, float]] = None
 
-@dataclass
+    def to_dict(self) -> dict:
+        return {'id': self.id, 'text': self.text, 'font': self.font.to_dict(), 'bbox': self.bbox,
+                'translated_text': self.translated_text, 'forces_line_break': self.forces_line_break, 'final_bbox': self.final_bbox}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Paragraph:
     id: str
     spans: List[TextSpan] = field(default_factory=list)
@@ -33,7 +47,11 @@ class Paragraph:
     list_marker_text: str = ""
     text_indent: float = 0.0
 
-@dataclass
+    def to_dict(self) -> dict:
+        return {'id': self.id, 'spans': [span.to_dict() for span in self.spans], 'is_list_item': self.is_list_item,
+                'list_marker_text': self.list_marker_text, 'text_indent': self.text_indent}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class TextBlock:
     id: str
     bbox: Tuple[float, float, float, float]
@@ -43,8 +61,17 @@ class TextBlock:
     spans: List[TextSpan] = field(default_factory=list, repr=False)
     available_width: float = 0.0  # NOUVEAU v2.2 : Largeur max disponible calculée par l'analyseur
 
-@dataclass
+    def to_dict(self) -> dict:
+        return {'id': self.id, 'bbox': self.bbox, 'paragraphs': [para.to_dict() for para in self.paragraphs],
+                'alignment': self.alignment, 'final_bbox': self.final_bbox,
+                'spans': [span.to_dict() for span in self.spans], 'available_width': self.available_width}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class PageObject:
     page_number: int
     dimensions: Tuple[float, float]
     text_blocks: List[TextBlock] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {'page_number': self.page_number, 'dimensions': self.dimensions,
+                'text_blocks': [block.to_dict() for block in self.text_blocks]}
@@ -7,11 +7,13 @@ PDF Layout Translator - Moteur de Mise en Page
 import logging
 import re
 from typing import List
+from dataclasses import replace
 import fitz
-import copy
 from core.data_model import PageObject
 from utils.font_manager import FontManager
 
+_WHITESPACE_SPLIT_RE = re.compile(r'(\s+)')
+
 class LayoutProcessor:
     def __init__(self, font_manager: FontManager):
         self.logger = logging.getLogger(__name__)
@@ -31,13 +33,14 @@ class LayoutProcessor:
 
     def process_pages(self, pages: List[PageObject]) -> List[PageObject]:
         self.debug_logger.info("--- DÉMARRAGE LAYOUTPROCESSOR (v2.9.1 - Repositionnement Vertical) ---")
+        trace = self.debug_logger.isEnabledFor(logging.INFO)
         for page in pages:
             self.debug_logger.info(f"  > Traitement de la Page {page.page_number}")
             
             vertical_offset = 0.0
 
             for block in sorted(page.text_blocks, key=lambda b: b.bbox[1]):
-                self.debug_logger.info(f"    -> Calcul du reflow pour le bloc {block.id}")
+                if trace: self.debug_logger.info(f"    -> Calcul du reflow pour le bloc {block.id}")
 
                 original_y_start = block.bbox[1]
                 original_height = block.bbox[3] - original_y_start
@@ -54,7 +57,8 @@ class LayoutProcessor:
                     full_para_text = "".join([span.text for span in para.spans])
                     lines = full_para_text.split('\n')
                     for line_text in lines:
-                        if not line_text.strip(): continue
+                        # isspace() teste sans allouer de copie nettoyée ('' est traité à part)
+                        if not line_text or line_text.isspace(): continue
                         representative_span = para.spans[0]
                         line_width = self._get_text_width(line_text, representative_span.font.name, representative_span.font.size)
                         if line_width > max_ideal_width:
@@ -72,18 +76,22 @@ class LayoutProcessor:
                 for para in block.paragraphs:
                     if not para.spans: continue
 
-                    self.debug_logger.info(f"       - Traitement du paragraphe {para.id}")
+                    if trace: self.debug_logger.info(f"       - Traitement du paragraphe {para.id}")
                     
                     all_words_info = []
                     for span in para.spans:
                         if span.text:
-                            words_and_breaks = re.split(r'(\s+)', span.text)
+                            words_and_breaks = _WHITESPACE_SPLIT_RE.split(span.text)
                             for item in words_and_breaks:
                                 if item: all_words_info.append((item, span))
 
                     x_start = block.bbox[0]
                     current_x = x_start
                     x_text_start = x_start
+                    # Invariants de la boucle par mot, résolus une fois par paragraphe
+                    x_limit = x_start + block_width_for_reflow
+                    get_text_width = self._get_text_width
+                    append_span = all_new_spans_for_block.append
                     max_font_size_in_line = para.spans[0].font.size
 
                     is_first_word_of_line = True
@@ -96,24 +104,24 @@ class LayoutProcessor:
                             if not word: continue
 
                         word_with_space = word
-                        word_width = self._get_text_width(word_with_space, span.font.name, span.font.size)
-                        line_height = span.font.size * 1.2
+                        font = span.font
+                        font_size = font.size
+                        word_width = get_text_width(word_with_space, font.name, font_size)
+                        line_height = font_size * 1.2
                         
-                        if current_x + word_width > x_start + block_width_for_reflow and not is_first_word_of_line:
+                        if current_x + word_width > x_limit and not is_first_word_of_line:
                             current_y += max_font_size_in_line * 1.2
                             current_x = x_text_start
-                            max_font_size_in_line = span.font.size
+                            max_font_size_in_line = font_size
                             is_first_word_of_line = True
 
-                        if span.font.size > max_font_size_in_line: max_font_size_in_line = span.font.size
+                        if font_size > max_font_size_in_line: max_font_size_in_line = font_size
                         
-                        new_span = copy.deepcopy(span)
-                        new_span.text = word_with_space
-                        new_span.final_bbox = (current_x, current_y, current_x + word_width, current_y + line_height)
-                        all_new_spans_for_block.append(new_span)
+                        # Copie superficielle : le FontInfo (jamais modifié) reste partagé entre les mots
+                        append_span(replace(span, text=word_with_space, final_bbox=(current_x, current_y, current_x + word_width, current_y + line_height)))
                         
                         current_x += word_width
-                        is_first_word_of_line = False if word.strip() else is_first_word_of_line
+                        is_first_word_of_line = False if not word.isspace() else is_first_word_of_line
                     
                     # --- DÉBUT DE LA CORRECTION v2.9.1 ---
                     # On utilise l'espacement de ligne complet (1.2) au lieu de l'espacement réduit (0.2)
@@ -9,16 +9,71 @@ import re
 from pathlib import Path
 from typing import List, Tuple, Dict, Any
 import fitz
-import copy
+import string
+from dataclasses import dataclass, replace
 from core.data_model import PageObject, TextBlock, TextSpan, FontInfo, Paragraph
 
+# Motifs compilés une seule fois : ils sont évalués pour chaque span / ligne / paragraphe.
+_LIST_MARKER_RE = re.compile(r'^(\s*[•\-–]\s*|\s*\d+\.?\s*)')
+_ASCII_UPPERCASE = frozenset(string.ascii_uppercase)
+# Seuls les blocs texte sont exploités : inutile que MuPDF extraie et encode les images dans le dict.
+_TEXT_ONLY_DICT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+@dataclass
+class _Line:
+    # Ligne regroupée pendant l'analyse : objet à slots plutôt qu'un dict par ligne.
+    __slots__ = ('spans', 'bbox')
+    spans: List[TextSpan]
+    bbox: Tuple[float, float, float, float]
+
+def _is_numbered_item(text: str) -> bool:
+    # Équivalent de re.match(r'^\s*\d+\.\s', text) en tests de chaînes simples ("12. Texte").
+    head, sep, rest = text.lstrip().partition('.')
+    return bool(sep) and head.isdecimal() and rest[:1].isspace()
+
 class PDFAnalyzer:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.debug_logger = logging.getLogger('debug_trace')
+        self._font_style_cache: Dict[str, Tuple[str, bool, bool]] = {}
+        self._color_hex_cache: Dict[int, str] = {}
+        self._font_info_cache: Dict[Tuple[str, float, int], FontInfo] = {}
+
+    def _get_font_style(self, raw_font_name: str) -> Tuple[str, bool, bool]:
+        # Un document n'utilise qu'une poignée de polices : on classe chaque nom brut une seule fois
+        # au lieu de refaire normalisation + lower() pour chaque span.
+        style = self._font_style_cache.get(raw_font_name)
+        if style is None:
+            font_name = self._normalize_font_name(raw_font_name)
+            lowered = font_name.lower()
+            style = (font_name, "bold" in lowered or "black" in lowered, "italic" in lowered)
+            self._font_style_cache[raw_font_name] = style
+        return style
+
+    def _get_color_hex(self, color: int) -> str:
+        # Même principe que pour les polices : quelques couleurs seulement, formatées une fois chacune.
+        color_hex = self._color_hex_cache.get(color)
+        if color_hex is None:
+            color_hex = f"#{color:06x}"
+            self._color_hex_cache[color] = color_hex
+        return color_hex
+
+    def _get_font_info(self, raw_font_name: str, size: float, color: int) -> FontInfo:
+        # FontInfo internés : tous les spans d'un même style partagent la même instance
+        # (jamais modifiée ensuite), au lieu d'un objet neuf par span.
+        key = (raw_font_name, size, color)
+        font_info = self._font_info_cache.get(key)
+        if font_info is None:
+            font_name, is_bold, is_italic = self._get_font_style(raw_font_name)
+            font_info = FontInfo(name=font_name, size=size, color=self._get_color_hex(color), is_bold=is_bold, is_italic=is_italic)
+            self._font_info_cache[key] = font_info
+        return font_info
 
     def _normalize_font_name(self, font_name: str) -> str:
-        return re.sub(r"^[A-Z]{6}\+", "", font_name)
+        # Retire le préfixe de sous-ensemble "ABCDEF+" sans passer par le moteur regex.
+        if len(font_name) > 6 and font_name[6] == '+' and _ASCII_UPPERCASE.issuperset(font_name[:6]):
+            return font_name[7:]
+        return font_name
 
     def _get_logical_reading_order(self, blocks: List[TextBlock], page_width: float) -> List[TextBlock]:
         # ... (cette méthode reste inchangée)
@@ -101,7 +156,13 @@ class PDFAnalyzer:
         if horizontal_alignment_gap > 25.0:
             return False, f"Désalignement de colonne significatif ({horizontal_alignment_gap:.1f} > 25.0)"
 
-        last_line_text_a = "".join(s.text for s in block_a.paragraphs[-1].spans).strip()
+        # Seule la fin du texte de A est testée : on remonte jusqu'au dernier span non vide au lieu
+        # de reconcaténer tout le paragraphe, qui grossit à chaque fusion (coût quadratique sinon).
+        last_line_text_a = ""
+        for span in reversed(block_a.paragraphs[-1].spans):
+            last_line_text_a = span.text.rstrip()
+            if last_line_text_a:
+                break
         first_span_text_b = block_b.paragraphs[0].spans[0].text.strip()
 
         if last_line_text_a.endswith(('.', '!', '?')):
@@ -119,7 +180,9 @@ class PDFAnalyzer:
 
         self.debug_logger.info("    > Démarrage de la phase d'unification des blocs...")
         unified_blocks = []
-        current_block = copy.deepcopy(blocks[0])
+        # Les blocs bruts sont construits pour cette page et ne servent qu'ici : ils sont fusionnés
+        # sur place, sans copie profonde (qui dupliquait aussi les FontInfo partagés).
+        current_block = blocks[0]
 
         for next_block in blocks[1:]:
             should_merge, reason = self._should_merge(current_block, next_block)
@@ -133,7 +196,7 @@ class PDFAnalyzer:
             else:
                 self.debug_logger.info(f"      - Finalisation du bloc unifié {current_block.id}. Raison de la rupture: {reason}")
                 unified_blocks.append(current_block)
-                current_block = copy.deepcopy(next_block)
+                current_block = next_block
         
         unified_blocks.append(current_block)
         self.debug_logger.info(f"    > Unification terminée. Nombre de blocs: {len(blocks)} -> {len(unified_blocks)}")
@@ -146,8 +209,15 @@ class PDFAnalyzer:
         """
         self.debug_logger.info("--- Application des instructions de regroupement sémantique de l'IA ---")
         
-        # Créer une copie profonde pour travailler dessus sans modifier l'original
-        working_pages = copy.deepcopy(raw_pages)
+        # Copie de la seule structure modifiée par la fusion (blocs, paragraphes, listes de spans) :
+        # les pages brutes restent intactes et les TextSpan, jamais modifiés ici, sont partagés.
+        working_pages = [
+            replace(page, text_blocks=[
+                replace(block, paragraphs=[replace(para, spans=list(para.spans)) for para in block.paragraphs], spans=list(block.spans))
+                for block in page.text_blocks
+            ])
+            for page in raw_pages
+        ]
 
         all_blocks_map: Dict[str, TextBlock] = {
             block.id: block for page in working_pages for block in page.text_blocks
@@ -216,11 +286,12 @@ class PDFAnalyzer:
         for page_num, page in enumerate(doc):
             page_dimensions = (page.rect.width, page.rect.height)
             page_obj = PageObject(page_number=page_num + 1, dimensions=page_dimensions)
-            blocks_data = page.get_text("dict", flags=fitz.TEXTFLAGS_DICT)["blocks"]
+            blocks_data = page.get_text("dict", flags=_TEXT_ONLY_DICT_FLAGS)["blocks"]
             
             raw_text_blocks = []
             block_counter = 0
-            for block_data in [b for b in blocks_data if b['type'] == 0]:
+            for block_data in blocks_data:
+                if block_data['type'] != 0: continue
                 block_counter += 1
                 block_id = f"P{page_num+1}_B{block_counter}"
                 text_block = TextBlock(id=block_id, bbox=block_data['bbox'])
@@ -229,55 +300,57 @@ class PDFAnalyzer:
                 span_counter = 0
                 for line_data in block_data.get('lines', []):
                     line_key = round(line_data['bbox'][1], 1)
-                    if line_key not in lines: lines[line_key] = {'spans': [], 'bbox': line_data['bbox']}
+                    # Une seule recherche dans le dictionnaire par ligne PDF, pas quatre par span
+                    line = lines.get(line_key)
+                    if line is None: line = lines[line_key] = _Line(spans=[], bbox=line_data['bbox'])
+                    line_spans = line.spans
                     for span_data in sorted(line_data.get('spans', []), key=lambda s: s['bbox'][0]):
                         span_counter += 1
                         span_id = f"{block_id}_S{span_counter}"
-                        font_name = self._normalize_font_name(span_data['font'])
-                        font_info = FontInfo(name=font_name, size=span_data['size'], color=f"#{span_data['color']:06x}", is_bold="bold" in font_name.lower() or "black" in font_name.lower(), is_italic="italic" in font_name.lower())
+                        font_info = self._get_font_info(span_data['font'], span_data['size'], span_data['color'])
                         span_text = span_data['text'].replace('\t', '    ')
-                        if lines[line_key]['spans'] and not lines[line_key]['spans'][-1].text.endswith(' '):
-                           if span_data['bbox'][0] > (lines[line_key]['spans'][-1].bbox[2] + 0.5):
-                                lines[line_key]['spans'][-1].text += " "
+                        if line_spans and not line_spans[-1].text.endswith(' '):
+                           if span_data['bbox'][0] > (line_spans[-1].bbox[2] + 0.5):
+                                line_spans[-1].text += " "
                         new_span = TextSpan(id=span_id, text=span_text, font=font_info, bbox=span_data['bbox'])
-                        lines[line_key]['spans'].append(new_span)
+                        line_spans.append(new_span)
                 if not lines: continue
-                sorted_lines = [lines[key] for key in sorted(lines.keys())]
+                sorted_lines = [line for _, line in sorted(lines.items(), key=lambda item: item[0])]
                 
                 current_paragraph_spans = []
                 para_counter = 1
                 temp_paragraphs = [] 
                 for i, line in enumerate(sorted_lines):
-                    if not line['spans']: continue
+                    if not line.spans: continue
                     
-                    current_paragraph_spans.extend(line['spans'])
+                    current_paragraph_spans.extend(line.spans)
                     is_last_line_of_block = (i == len(sorted_lines) - 1)
                     force_break = False
                     reason = ""
                     
                     if not is_last_line_of_block:
                         next_line = sorted_lines[i+1]
-                        if not next_line['spans']: continue
+                        if not next_line.spans: continue
                         
-                        next_line_text = next_line['spans'][0].text.strip()
+                        next_line_text = next_line.spans[0].text.strip()
                         
-                        line_height = line['bbox'][3] - line['bbox'][1] or 10
-                        vertical_gap = next_line['bbox'][1] - line['bbox'][3]
+                        line_height = line.bbox[3] - line.bbox[1] or 10
+                        vertical_gap = next_line.bbox[1] - line.bbox[3]
                         if vertical_gap > line_height * 0.4:
                             force_break = True
                             reason = f"Écart vertical large ({vertical_gap:.1f})"
 
                         if not force_break:
-                            current_text = "".join(s.text for s in line['spans']).strip()
-                            is_title_style = current_text.isupper() and all(s.font.is_bold for s in line['spans'])
-                            is_next_line_body = not next_line['spans'][0].font.is_bold
+                            # Le test de graisse est le moins coûteux : on ne concatène le texte que pour les lignes en gras.
+                            is_title_style = all(s.font.is_bold for s in line.spans) and "".join([s.text for s in line.spans]).strip().isupper()
+                            is_next_line_body = not next_line.spans[0].font.is_bold
                             
                             if is_title_style and is_next_line_body:
                                 force_break = True
                                 reason = "Titre détecté (MAJUSCULES/Gras -> Normal)"
 
                         if not force_break:
-                            if next_line_text.startswith(('•', '-', '–')) or re.match(r'^\s*\d+\.\s', next_line_text):
+                            if next_line_text.startswith(('•', '-', '–')) or _is_numbered_item(next_line_text):
                                 force_break = True
                                 reason = "Nouvel item de liste explicite"
                     
@@ -292,7 +365,7 @@ class PDFAnalyzer:
                 for para in temp_paragraphs:
                     if para.spans:
                         first_span = para.spans[0]
-                        match = re.match(r'^(\s*[•\-–]\s*|\s*\d+\.?\s*)', first_span.text)
+                        match = _LIST_MARKER_RE.match(first_span.text)
                         if match:
                             para.is_list_item = True
                             marker_end_pos = match.end()
@@ -301,9 +374,7 @@ class PDFAnalyzer:
                             para.list_marker_text = marker_text.strip()
                             first_span.text = marker_text
                             if content_text.strip():
-                                new_span = copy.deepcopy(first_span)
-                                new_span.id = f"{first_span.id}_cont"
-                                new_span.text = content_text
+                                new_span = replace(first_span, id=f"{first_span.id}_cont", text=content_text)
                                 marker_width_ratio = len(marker_text) / len(first_span.text) if len(first_span.text) > 0 else 0.5
                                 marker_width = (first_span.bbox[2] - first_span.bbox[0]) * marker_width_ratio
                                 new_bbox = list(first_span.bbox)
@@ -351,11 +422,12 @@ class PDFAnalyzer:
         for page_num, page in enumerate(doc):
             page_dimensions = (page.rect.width, page.rect.height)
             page_obj = PageObject(page_number=page_num + 1, dimensions=page_dimensions)
-            blocks_data = page.get_text("dict", flags=fitz.TEXTFLAGS_DICT)["blocks"]
+            blocks_data = page.get_text("dict", flags=_TEXT_ONLY_DICT_FLAGS)["blocks"]
             
             raw_text_blocks = []
             block_counter = 0
-            for block_data in [b for b in blocks_data if b['type'] == 0]:
+            for block_data in blocks_data:
+                if block_data['type'] != 0: continue
                 block_counter += 1
                 block_id = f"P{page_num+1}_B{block_counter}"
                 text_block = TextBlock(id=block_id, bbox=block_data['bbox'])
@@ -364,25 +436,27 @@ class PDFAnalyzer:
                 span_counter = 0
                 for line_data in block_data.get('lines', []):
                     line_key = round(line_data['bbox'][1], 1)
-                    if line_key not in lines: lines[line_key] = {'spans': [], 'bbox': line_data['bbox']}
+                    # Une seule recherche dans le dictionnaire par ligne PDF, pas quatre par span
+                    line = lines.get(line_key)
+                    if line is None: line = lines[line_key] = _Line(spans=[], bbox=line_data['bbox'])
+                    line_spans = line.spans
                     for span_data in sorted(line_data.get('spans', []), key=lambda s: s['bbox'][0]):
                         span_counter += 1
                         span_id = f"{block_id}_S{span_counter}"
-                        font_name = self._normalize_font_name(span_data['font'])
-                        font_info = FontInfo(name=font_name, size=span_data['size'], color=f"#{span_data['color']:06x}", is_bold="bold" in font_name.lower() or "black" in font_name.lower(), is_italic="italic" in font_name.lower())
+                        font_info = self._get_font_info(span_data['font'], span_data['size'], span_data['color'])
                         span_text = span_data['text'].replace('\t', '    ')
-                        if lines[line_key]['spans'] and not lines[line_key]['spans'][-1].text.endswith(' '):
-                           if span_data['bbox'][0] > (lines[line_key]['spans'][-1].bbox[2] + 0.5):
-                                lines[line_key]['spans'][-1].text += " "
+                        if line_spans and not line_spans[-1].text.endswith(' '):
+                           if span_data['bbox'][0] > (line_spans[-1].bbox[2] + 0.5):
+                                line_spans[-1].text += " "
                         new_span = TextSpan(id=span_id, text=span_text, font=font_info, bbox=span_data['bbox'])
-                        lines[line_key]['spans'].append(new_span)
+                        line_spans.append(new_span)
                 
                 if not lines: continue
                 
                 temp_paragraphs = []
                 para_counter = 1
-                for line_key in sorted(lines.keys()):
-                    line_spans = lines[line_key]['spans']
+                for _, line in sorted(lines.items(), key=lambda item: item[0]):
+                    line_spans = line.spans
                     if line_spans:
                         para_id = f"{block_id}_P{para_counter}"
                         paragraph = Paragraph(id=para_id, spans=list(line_spans))
@@ -31,6 +31,8 @@ class PDFReconstructor:
 
     def render_pages(self, pages: List[PageObject], output_path: Path):
         self.debug_logger.info("--- DÉMARRAGE PDFRECONSTRUCTOR (v2.1 - Mode Dessin Direct) ---")
+        # Traces par bloc/span : le formatage des f-strings n'est fait que si la trace est active
+        trace = self.debug_logger.isEnabledFor(logging.INFO)
         doc = fitz.open()
 
         for page_data in pages:
@@ -47,7 +49,7 @@ class PDFReconstructor:
                         self.debug_logger.error(f"  -> ERREUR enregistrement police '{font_name}': {e}")
 
             for block in page_data.text_blocks:
-                self.debug_logger.info(f"  > Dessin du TextBlock ID: {block.id}")
+                if trace: self.debug_logger.info(f"  > Dessin du TextBlock ID: {block.id}")
                 if not block.spans: continue
                 
                 for span in block.spans:
@@ -66,8 +68,9 @@ class PDFReconstructor:
                     fontsize = span.font.size
                     color_rgb = self._hex_to_rgb(span.font.color)
 
-                    self.debug_logger.info(f"    - Rendu du mot/span : '{text.strip()}'")
-                    self.debug_logger.info(f"      -> pos={pos}, font='{fontname}', size={fontsize}, color={color_rgb}")
+                    if trace:
+                        self.debug_logger.info(f"    - Rendu du mot/span : '{text.strip()}'")
+                        self.debug_logger.info(f"      -> pos={pos}, font='{fontname}', size={fontsize}, color={color_rgb}")
                     
                     try:
                         rc = page.insert_text(
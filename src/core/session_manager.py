@@ -400,8 +400,7 @@ class SessionManager:
         session_dir = self.sessions_dir / session_id
         export_file = session_dir / "translation_export.md"
         
-        with open(export_file, 'w', encoding='utf-8') as f:
-            f.write(export_data)
+        self.file_utils.write_text(export_file, export_data)
         
         self.logger.info(f"Export de traduction sauvegardé pour {session_id}")
         return export_file
@@ -423,8 +422,7 @@ class SessionManager:
         session_dir = self.sessions_dir / session_id
         import_file = session_dir / "translation_import.md"
         
-        with open(import_file, 'w', encoding='utf-8') as f:
-            f.write(import_data)
+        self.file_utils.write_text(import_file, import_data)
         
         # Sauvegarder aussi en JSON après parsing
         parsed_file = session_dir / "parsed_translations.json"
@@ -4,14 +4,21 @@
 PDF Layout Translator - Extracteur de texte pour traduction
 Génère un fichier XLIFF à partir du DOM de la page, en préservant les styles via HTML.
 """
+import html
 import logging
+import re
 from typing import List, Dict, Any
-from lxml import etree
-from dataclasses import asdict
-from core.data_model import PageObject, FontInfo
+from xml.sax.saxutils import escape
+from core.data_model import PageObject, FontInfo, Paragraph
 
-class CDATA(etree.CDATA):
-    pass
+# Échappement d'attribut identique à celui de libxml2 (&, <, >, ", et les blancs de contrôle)
+_ATTR_ENTITIES = {'"': '&quot;', '\n': '&#10;', '\r': '&#13;', '\t': '&#9;'}
+# Caractères interdits en XML 1.0 (lxml les refusait déjà à la construction) : caractères de contrôle
+# et demi-codets de substitution isolés (couche texte de PDF corrompue), qu'encode('utf-8') refuserait plus loin
+_XML_INCOMPATIBLE_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff]')
+
+def _quote_attr(value: str) -> str:
+    return escape(value, _ATTR_ENTITIES)
 
 class TextExtractor:
     def __init__(self):
@@ -19,53 +26,75 @@ class TextExtractor:
         self.styles: Dict[str, FontInfo] = {}
         self.style_map: Dict[tuple, str] = {}
         self.style_counter = 1
+        # Cache de premier niveau par identité d'objet : évite de reconstruire la clé de style
+        # (5 attributs + round) pour un FontInfo déjà vu. Valide le temps d'un create_xliff.
+        self._font_id_cache: Dict[int, str] = {}
 
     def _get_style_class(self, font_info: FontInfo) -> str:
+        cached = self._font_id_cache.get(id(font_info))
+        if cached is not None:
+            return cached
+
         style_key = (font_info.name, round(font_info.size, 2), font_info.color, font_info.is_bold, font_info.is_italic)
-        if style_key in self.style_map:
-            return self.style_map[style_key]
-        
-        class_name = f"c{self.style_counter}"
-        self.styles[class_name] = font_info
-        self.style_map[style_key] = class_name
-        self.style_counter += 1
+        class_name = self.style_map.get(style_key)
+        if class_name is None:
+            class_name = f"c{self.style_counter}"
+            self.styles[class_name] = font_info
+            self.style_map[style_key] = class_name
+            self.style_counter += 1
+        self._font_id_cache[id(font_info)] = class_name
         return class_name
 
-    def create_xliff(self, pages: List[PageObject], source_lang: str, target_lang: str) -> Dict[str, Any]:
-        self.styles.clear(); self.style_map.clear(); self.style_counter = 1
+    def _paragraph_to_html(self, paragraph: Paragraph) -> str:
+        # Fragment HTML construit par gabarit de chaînes : aucun Element lxml par span.
+        # La sortie est identique à etree.tostring(..., method='html') (échappement de &, <, > et \r).
+        parts = ['<p>']
+        for span in paragraph.spans:
+            # [CORRECTION FINALE] Ajouter l'ID du span comme une ancre dans le HTML (L'ANCRE INDESTRUCTIBLE)
+            text = html.escape(span.text, quote=False).replace('\r', '&#13;')
+            parts.append(f'<span class="{self._get_style_class(span.font)}" id="{span.id}">{text}</span>')
+        parts.append('</p>')
+        return ''.join(parts)
 
-        for page in pages:
-            for block in page.text_blocks:
-                for para in block.paragraphs:
-                    for span in para.spans:
-                        self._get_style_class(span.font)
+    def create_xliff(self, pages: List[PageObject], source_lang: str, target_lang: str) -> Dict[str, Any]:
+        self.styles.clear(); self.style_map.clear(); self._font_id_cache.clear(); self.style_counter = 1
 
-        root = etree.Element('xliff', version='1.2', xmlns='urn:oasis:names:tc:xliff:document:1.2')
-        file_elem = etree.SubElement(root, 'file', **{'source-language': source_lang, 'target-language': target_lang, 'datatype': 'plaintext', 'original': 'pdf-document'})
-        body = etree.SubElement(file_elem, 'body')
+        # Pas de passe préalable sur les styles : _get_style_class les enregistre à la première
+        # rencontre pendant la construction, dans le même ordre de parcours.
 
+        # Le schéma est fixe (xliff/file/body/trans-unit/source/target) : le document est écrit
+        # directement par gabarits, sans aucun Element. Le fragment HTML est déjà échappé,
+        # il ne peut donc pas contenir la séquence ']]>' et se place tel quel en CDATA.
+        units = []
         for page in pages:
             for block in page.text_blocks:
                 for paragraph in block.paragraphs:
-                    p_element = etree.Element('p')
-                    for span in paragraph.spans:
-                        # [CORRECTION FINALE] Ajouter l'ID du span comme une ancre dans le HTML
-                        span_element = etree.SubElement(p_element, 'span', attrib={
-                            'class': self._get_style_class(span.font),
-                            'id': span.id  # L'ANCRE INDESTRUCTIBLE
-                        })
-                        span_element.text = span.text
-                    
-                    para_html_str = etree.tostring(p_element, encoding='unicode', method='html')
+                    para_html_str = self._paragraph_to_html(paragraph)
                     if para_html_str.strip():
-                        trans_unit = etree.SubElement(body, 'trans-unit', id=paragraph.id)
-                        source = etree.SubElement(trans_unit, 'source')
-                        source.text = CDATA(para_html_str)
-                        etree.SubElement(trans_unit, 'target')
-        
-        xliff_string = etree.tostring(root, pretty_print=True, xml_declaration=True, encoding='utf-8').decode('utf-8')
+                        units.append(
+                            f'      <trans-unit id="{_quote_attr(paragraph.id)}">\n'
+                            f'        <source><![CDATA[{para_html_str}]]></source>\n'
+                            f'        <target/>\n'
+                            f'      </trans-unit>\n'
+                        )
+
+        xliff_text = ''.join([
+            "<?xml version='1.0' encoding='utf-8'?>\n",
+            '<xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:document:1.2">\n',
+            f'  <file source-language="{_quote_attr(source_lang)}" target-language="{_quote_attr(target_lang)}" datatype="plaintext" original="pdf-document">\n',
+            '    <body>\n' if units else '    <body/>\n',
+            *units,
+            '    </body>\n' if units else '',
+            '  </file>\n',
+            '</xliff>\n',
+        ])
+        if _XML_INCOMPATIBLE_RE.search(xliff_text):
+            raise ValueError("All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
         
+        # Le XLIFF reste en octets UTF-8 : l'écrire sur disque ne demande aucun ré-encodage,
+        # seul l'affichage dans l'interface le décode.
         return { 
-            "xliff": xliff_string, 
-            "styles": {name: asdict(font) for name, font in self.styles.items()} 
+            "xliff": xliff_text.encode('utf-8'), 
+            # FontInfo.to_dict() : copie directe des champs, sans le deepcopy récursif d'asdict()
+            "styles": {name: font.to_dict() for name, font in self.styles.items()} 
         }
@@ -4,27 +4,46 @@
 PDF Layout Translator - Parseur de traductions
 Parse le fichier XLIFF retourné par l'utilisateur.
 """
+import io
 import logging
-from typing import Dict
-from xml.etree import ElementTree
+from typing import Dict, Union
+from lxml import etree
+
+_XLIFF_NS = 'urn:oasis:names:tc:xliff:document:1.2'
+# Balises attendues avec ou sans l'espace de noms XLIFF 1.2 (texte collé à la main, sans xmlns)
+_TARGET_TAG_FOR_UNIT = {f'{{{_XLIFF_NS}}}trans-unit': f'{{{_XLIFF_NS}}}target', 'trans-unit': 'target'}
 
 class TranslationParser:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def parse_xliff(self, xliff_content: str) -> Dict[str, str]:
+    def parse_xliff(self, xliff_content: Union[str, bytes]) -> Dict[str, str]:
         self.logger.info("Parsing du fichier XLIFF traduit (Jalon 2 - Mode Paragraphe)")
         translations = {}
+        # Contenu déjà en octets (lu depuis un fichier) : transmis tel quel, l'encodage déclaré fait foi.
+        # Texte collé (str) : ré-encodé en UTF-8, l'encodage est alors imposé au parseur pour qu'une
+        # déclaration encoding="iso-8859-1" restée dans le prologue ne fausse pas le décodage.
+        encoding = None
+        if isinstance(xliff_content, str):
+            xliff_content = xliff_content.encode('utf-8')
+            encoding = 'utf-8'
         try:
-            xliff_content = xliff_content.replace('xmlns="urn:oasis:names:tc:xliff:document:1.2"', '')
-            root = ElementTree.fromstring(xliff_content)
-            for trans_unit in root.findall(".//trans-unit"):
+            # Lecture en flux : chaque <trans-unit> est traité à sa balise fermante puis libéré,
+            # l'arbre complet n'est jamais construit. Comme expat, les entités internes déclarées dans
+            # la DTD sont résolues ; une entité externe n'est jamais chargée et fait échouer le parsing.
+            # Les balises qualifiées sont reconnues directement : plus de copie du texte pour retirer le xmlns.
+            units = etree.iterparse(io.BytesIO(xliff_content), events=('end',), tag=list(_TARGET_TAG_FOR_UNIT),
+                                    encoding=encoding, resolve_entities='internal', no_network=True)
+            for _, trans_unit in units:
                 unit_id = trans_unit.get('id')
-                target = trans_unit.find('target')
+                target = trans_unit.find(_TARGET_TAG_FOR_UNIT[trans_unit.tag])
                 if unit_id and target is not None:
                     # Les ID sont maintenant des ID de paragraphes
                     translations[unit_id] = target.text.strip() if target.text else ""
-        except ElementTree.ParseError as e:
+                trans_unit.clear(keep_tail=True)
+                while trans_unit.getprevious() is not None:
+                    del trans_unit.getparent()[0]
+        except etree.XMLSyntaxError as e:
             self.logger.error(f"Erreur de parsing XLIFF: {e}")
             raise ValueError("Le contenu fourni n'est pas un XML XLIFF valide.")
         
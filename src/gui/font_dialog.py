@@ -8,24 +8,51 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import logging
 
+# Délai de regroupement des frappes avant de relancer le filtrage (ms)
+AUTOCOMPLETE_DELAY_MS = 80
+# Touches qui ne modifient pas le texte saisi : aucun filtrage à relancer
+_NAV_KEYS = frozenset({
+    "BackSpace", "Left", "Right", "Up", "Down", "Return", "KP_Enter", "Tab", "Escape",
+    "Shift_L", "Shift_R", "Control_L", "Control_R",
+})
+
 class AutocompleteCombobox(ttk.Combobox):
-    def set_completion_list(self, completion_list):
-        self._completion_list = sorted(completion_list)
+    def set_completion_list(self, completion_list, presorted=False):
+        # presorted : la liste fournie est déjà triée et ne sera pas modifiée, on la garde telle quelle
+        self._completion_list = completion_list if presorted else sorted(completion_list)
+        # Versions minuscules calculées une fois, et non à chaque frappe pour chaque police
+        self._completion_list_lower = [item.lower() for item in self._completion_list]
         self._hits = []
+        self._hits_query = None
         self._hit_index = 0
+        self._pending_autocomplete = None
         self.position = 0
+        self._shown_values = None
         self.bind('<KeyRelease>', self.handle_keyrelease)
-        self['values'] = self._completion_list
+        # La liste n'est convertie en liste Tcl qu'à l'ouverture du menu déroulant
+        self.configure(postcommand=self._fill_values)
+
+    def _fill_values(self):
+        # Si le texte affiché prolonge le préfixe filtré, le menu ne montre que les correspondances
+        if self._hits and self._hits_query is not None and self.get().lower().startswith(self._hits_query):
+            values = self._hits
+        else:
+            values = self._completion_list
+        if values is not self._shown_values:
+            self._shown_values = values
+            self['values'] = values
 
     def autocomplete(self, delta=0):
         if delta: self.delete(self.position, tk.END)
         else: self.position = len(self.get())
         
-        _hits = [item for item in self._completion_list if item.lower().startswith(self.get().lower())]
-        
-        if _hits != self._hits:
+        # Les correspondances ne dépendent que du préfixe saisi : on ne les recalcule (et ne
+        # remet l'index à zéro) que si ce préfixe a changé, sans comparer les listes entre elles.
+        query = self.get().lower()
+        if query != self._hits_query:
+            self._hits_query = query
             self._hit_index = 0
-            self._hits = _hits
+            self._hits = [item for item, item_lower in zip(self._completion_list, self._completion_list_lower) if item_lower.startswith(query)]
         
         if self._hits:
             self._hit_index = (self._hit_index + delta) % len(self._hits)
@@ -35,9 +62,32 @@ class AutocompleteCombobox(ttk.Combobox):
             self.icursor(len(current_text))
             
     def handle_keyrelease(self, event):
-        if event.keysym in ("BackSpace", "Left", "Right", "Up", "Down", "Return", "KP_Enter"): return
+        if event.keysym in _NAV_KEYS: return
+        # Une rafale de frappes ne déclenche qu'un seul filtrage, une fois la saisie posée
+        if self._pending_autocomplete is not None:
+            self.after_cancel(self._pending_autocomplete)
+        self._pending_autocomplete = self.after(AUTOCOMPLETE_DELAY_MS, self._run_pending_autocomplete)
+
+    def _run_pending_autocomplete(self):
+        self._pending_autocomplete = None
         self.autocomplete()
 
+    def cancel_autocomplete(self):
+        # Abandonne un filtrage différé (ex. : la valeur vient d'être choisie dans la liste)
+        if getattr(self, '_pending_autocomplete', None) is not None:
+            self.after_cancel(self._pending_autocomplete)
+            self._pending_autocomplete = None
+
+    def flush_autocomplete(self):
+        # Exécute tout de suite un filtrage différé, pour lire la valeur complétée comme avant le délai
+        if getattr(self, '_pending_autocomplete', None) is not None:
+            self.cancel_autocomplete()
+            self.autocomplete()
+
+    def destroy(self):
+        self.cancel_autocomplete()
+        super().destroy()
+
 
 class FontDialog:
     def __init__(self, parent, font_manager, missing_fonts_report):
@@ -46,6 +96,16 @@ class FontDialog:
         self.report = missing_fonts_report
         self.logger = logging.getLogger(__name__)
         self.user_choices = {}
+        # Police manquante de chaque ligne du Treeview, sans relire la ligne côté Tk
+        self._row_fonts = {}
+        self.window = None
+        # Rien à demander : pas de fenêtre, show() rend la main immédiatement
+        if not self.report.get('missing_fonts'):
+            return
+        # Liste des polices système lue une fois pour toute la durée du dialogue :
+        # liste pour l'autocomplétion, ensemble pour la validation
+        self._all_fonts_list = self.font_manager.get_all_available_fonts()
+        self._all_fonts_set = frozenset(self._all_fonts_list)
         
         self.window = tk.Toplevel(parent)
         self.window.title("Gestion des Polices Manquantes (Action Requise)")
@@ -74,8 +134,24 @@ class FontDialog:
         scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
         scrollbar.pack(side="right", fill="y"); self.tree.configure(yscrollcommand=scrollbar.set)
 
+        self.tree.tag_configure("bad", background="#fee")
         self.tree.bind("<Double-1>", self._on_edit_cell)
 
+        # Un seul éditeur pour toutes les cellules : créé, trié et lié une fois, puis
+        # simplement déplacé au-dessus de la cellule éditée.
+        # L'utilisateur ne peut choisir que parmi les polices que le système connaît.
+        self._edit_combo = AutocompleteCombobox(self.tree)
+        self._edit_combo.set_completion_list(self._all_fonts_list, presorted=True)
+        self._edit_item_id = None
+        self._edit_missing_font = None
+        self._edit_combo.bind("<<ComboboxSelected>>", self._on_combo_selected)
+        for sequence in ("<FocusOut>", "<Return>", "<KP_Enter>"):
+            self._edit_combo.bind(sequence, self._on_combo_close)
+
+        # Erreurs de validation affichées dans le dialogue, sans boîte modale
+        self._error_label = ttk.Label(main_frame, foreground="red", wraplength=780, justify="left")
+        self._error_label.pack(fill="x", pady=(10, 0))
+
         button_frame = ttk.Frame(main_frame); button_frame.pack(fill="x", pady=(10, 0))
         ttk.Button(button_frame, text="Annuler le Processus", command=self._on_cancel).pack(side="right")
         ttk.Button(button_frame, text="Valider et Continuer", command=self._on_validate).pack(side="right", padx=(0, 10))
@@ -86,33 +162,42 @@ class FontDialog:
             suggestion = self.font_manager.get_font_mapping(font_name) or ""
             
             self.user_choices[font_name] = tk.StringVar(value=suggestion)
-            self.tree.insert("", "end", values=(font_name, suggestion))
+            item_id = self.tree.insert("", "end", values=(font_name, suggestion))
+            self._row_fonts[item_id] = font_name
 
     def _on_edit_cell(self, event):
         item_id = self.tree.identify_row(event.y)
         column = self.tree.identify_column(event.x)
         if not item_id or column != "#2": return
 
-        missing_font = self.tree.item(item_id, "values")[0]
+        missing_font = self._row_fonts[item_id]
         x, y, width, height = self.tree.bbox(item_id, column)
         
-        combo = AutocompleteCombobox(self.tree)
-        # L'utilisateur ne peut choisir que parmi les polices que le système connaît.
-        combo.set_completion_list(self.font_manager.get_all_available_fonts())
-        combo.set(self.user_choices[missing_font].get())
-        combo.place(x=x, y=y, width=width, height=height)
-        combo.focus_set()
-        
-        def on_combo_close(event=None):
-            new_value = combo.get()
-            self.tree.set(item_id, "replacement", new_value)
-            self.user_choices[missing_font].set(new_value)
-            combo.destroy()
+        self._edit_item_id = item_id
+        self._edit_missing_font = missing_font
+        self._edit_combo.set(self.user_choices[missing_font].get())
+        self._edit_combo.place(x=x, y=y, width=width, height=height)
+        self._edit_combo.focus_set()
 
-        combo.bind("<<ComboboxSelected>>", on_combo_close)
-        combo.bind("<FocusOut>", on_combo_close)
-        combo.bind("<Return>", on_combo_close)
-        combo.bind("<KP_Enter>", on_combo_close)
+    def _on_combo_selected(self, event=None):
+        # Valeur prise telle quelle dans la liste : un filtrage encore en attente ne doit pas la réécrire
+        self._edit_combo.cancel_autocomplete()
+        self._on_combo_close(event)
+
+    def _on_combo_close(self, event=None):
+        # Une sélection dans la liste déclenche aussi FocusOut : seule la première fermeture compte
+        if self._edit_item_id is None:
+            self._edit_combo.cancel_autocomplete()
+            return
+        # Une frappe validée (Entrée, perte du focus) avant la fin du délai est complétée maintenant,
+        # comme si le filtrage avait déjà eu lieu ; le rappel différé ne touche plus le widget masqué.
+        self._edit_combo.flush_autocomplete()
+        new_value = self._edit_combo.get()
+        self.tree.set(self._edit_item_id, "replacement", new_value)
+        self.user_choices[self._edit_missing_font].set(new_value)
+        self._edit_item_id = None
+        self._edit_missing_font = None
+        self._edit_combo.place_forget()
 
     def _on_validate(self):
         """
@@ -120,50 +205,67 @@ class FontDialog:
         C'est le gardien qui empêche les données invalides de continuer.
         """
         errors = []
-        all_system_fonts = self.font_manager.get_all_available_fonts()
+        invalid_fonts = set()
         mappings_to_save = {}
 
-        for item_id in self.tree.get_children():
-            font_name, replacement = self.tree.item(item_id, "values")
+        # user_choices est tenu à jour à chaque édition et suit l'ordre des lignes :
+        # aucun aller-retour Tcl par ligne pour relire le Treeview.
+        for font_name, choice in self.user_choices.items():
+            replacement = choice.get()
             
             # Vérification 1: L'utilisateur a-t-il fait un choix ?
             if not replacement or not replacement.strip():
                 errors.append(f"- Aucune police n'a été choisie pour '{font_name}'.")
+                invalid_fonts.add(font_name)
                 continue
 
             # Vérification 2: Le choix de l'utilisateur est-il une police qui existe réellement ?
-            if replacement not in all_system_fonts:
+            if replacement not in self._all_fonts_set:
                 errors.append(f"- La police '{replacement}' choisie pour '{font_name}' n'est pas une police système valide.")
+                invalid_fonts.add(font_name)
                 continue
             
             # Si tout est bon, on prépare la sauvegarde
             mappings_to_save[font_name] = replacement
 
+        # Les lignes fautives sont surlignées dans le tableau
+        for item_id, font_name in self._row_fonts.items():
+            self.tree.item(item_id, tags=("bad",) if font_name in invalid_fonts else ())
+
         # Si des erreurs ont été trouvées, on bloque le processus et on informe l'utilisateur.
         if errors:
-            error_message = "Impossible de valider. Veuillez corriger les erreurs suivantes :\n\n" + "\n".join(errors)
-            messagebox.showerror("Erreurs de Validation des Polices", error_message, parent=self.window)
+            error_message = "Impossible de valider. Veuillez corriger les erreurs suivantes :\n" + "\n".join(errors)
+            self._error_label.configure(text=error_message)
             return  # On ne ferme PAS la fenêtre. L'utilisateur doit corriger.
+        self._error_label.configure(text="")
 
         # Si AUCUNE erreur n'a été trouvée, on peut sauvegarder et fermer.
         try:
-            for original_font, replacement_font in mappings_to_save.items():
-                self.font_manager.create_font_mapping(original_font, replacement_font)
+            self.font_manager.bulk_create_font_mappings(mappings_to_save)
             
-            messagebox.showinfo("Succès", "Correspondances de polices validées et sauvegardées.", parent=self.window)
+            self._modal(messagebox.showinfo, "Succès", "Correspondances de polices validées et sauvegardées.")
             self.window.destroy() # Le processus peut continuer en toute sécurité.
         except Exception as e:
-            messagebox.showerror("Erreur", f"Une erreur est survenue lors de la sauvegarde : {e}", parent=self.window)
+            self._modal(messagebox.showerror, "Erreur", f"Une erreur est survenue lors de la sauvegarde : {e}")
+
+    def _modal(self, show, *args, **kwargs):
+        # La boîte modale prend la main : on lui cède le grab au lieu de l'imbriquer dans le nôtre
+        self.window.grab_release()
+        try:
+            return show(*args, parent=self.window, **kwargs)
+        finally:
+            self.window.grab_set()
 
     def _on_cancel(self):
         # Annuler signifie ici abandonner TOUT le processus de traduction. C'est une action bloquante.
-        if messagebox.askyesno("Confirmation d'Annulation", 
-                               "Ceci annulera l'ensemble du processus d'analyse et de traduction.\n\nÊtes-vous sûr de vouloir abandonner ?", 
-                               icon='warning', parent=self.window):
+        if self._modal(messagebox.askyesno, "Confirmation d'Annulation", 
+                       "Ceci annulera l'ensemble du processus d'analyse et de traduction.\n\nÊtes-vous sûr de vouloir abandonner ?", 
+                       icon='warning'):
             # Pour réellement annuler, il faudrait une communication avec la fenêtre principale.
             # Pour l'instant, la destruction de la fenêtre arrêtera le flux.
             self.user_choices = {} # Efface les choix
             self.window.destroy()
 
     def show(self):
+        if self.window is None: return
         self.parent.wait_window(self.window)
@@ -12,9 +12,7 @@ import logging
 from pathlib import Path
 import json
 import os
-from dataclasses import asdict
 from lxml import etree
-import copy
 from typing import List, Dict
 
 from core.session_manager import SessionManager
@@ -23,6 +21,7 @@ from core.text_extractor import TextExtractor
 from core.translation_parser import TranslationParser
 from core.auto_translator import AutoTranslator, GOOGLETRANS_AVAILABLE
 from utils.font_manager import FontManager
+from utils.file_utils import FileUtils
 from core.layout_processor import LayoutProcessor
 from core.pdf_reconstructor import PDFReconstructor
 from core.data_model import PageObject, TextBlock, TextSpan, FontInfo, Paragraph
@@ -72,6 +71,25 @@ Exemple de sortie attendue :
 Voici le JSON brut (fichier 0) à traiter :
 """
 
+# Taille de l'aperçu des données brutes dans l'onglet IA : le JSON complet se copie par bouton
+AI_INPUT_PREVIEW_CHARS = 64_000
+
+# Taille des tranches de texte insérées à chaque cycle d'inactivité de Tk dans les grandes zones de texte
+TEXT_STREAM_CHUNK_CHARS = 32_768
+
+ANALYSIS_SUMMARY_TEMPLATE = "Analyse terminée.\n- Pages: {pages}\n- Blocs de texte: {blocks}\n- Segments de style (spans): {spans}"
+
+def _write_json(path: Path, data) -> None:
+    # Document encodé en entier puis écrit en un seul appel, au lieu des petites écritures de json.dump() ;
+    # fins de ligne natives, comme l'ancien fichier ouvert en mode texte
+    FileUtils.write_text(path, json.dumps(data, indent=2))
+
+# Formateur partagé par les traces de débogage de toutes les sessions
+_DEBUG_TRACE_FORMATTER = logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+
+# Expression XPath compilée une fois : recherche des ancres <span id="..."> dans chaque paragraphe traduit
+_TRANSLATED_SPANS_XPATH = etree.XPath('.//span[@id]')
+
 class MainWindow:
     def __init__(self, root: tk.Tk, config_manager):
         self.root = root
@@ -89,8 +107,14 @@ class MainWindow:
         self.pdf_reconstructor = None
         
         self.current_session_id = None
+        self._session_dir = None # Répertoire de la session courante, résolu une fois à sa création
+        self._text_streams = {} # Chargements par tranches en cours (_stream_text), par widget
         self.processing = False
         self.raw_page_objects: List[PageObject] = [] # Pour stocker les données brutes
+        self._raw_data_json = "" # JSON complet du fichier 0, pour le presse-papiers
+        # Dernier DOM écrit dans 1_dom_analysis.json, avec sa session : l'export XLIFF le réutilise
+        # sans relire le fichier. Lecture seule (le layout, qui modifie le DOM, recharge le fichier).
+        self._current_page_objects = (None, [])
         
         self.use_ai_flow_var = tk.BooleanVar(value=False)
         
@@ -213,6 +237,7 @@ class MainWindow:
         input_frame.pack(fill='both', expand=True)
         self.ai_input_text = scrolledtext.ScrolledText(input_frame, height=10, wrap='word')
         self.ai_input_text.pack(fill='both', expand=True)
+        ttk.Button(input_frame, text="Copier les Données Complètes", command=self._copy_raw_data_to_clipboard).pack(pady=(5,0))
 
         bottom_frame = ttk.Frame(main_paned)
         main_paned.add(bottom_frame, weight=2)
@@ -233,6 +258,12 @@ class MainWindow:
         self.root.clipboard_append(AI_GROUPING_PROMPT)
         self.status_label.config(text="Prompt copié dans le presse-papiers.")
 
+    def _copy_raw_data_to_clipboard(self):
+        if not self._raw_data_json: return
+        self.root.clipboard_clear()
+        self.root.clipboard_append(self._raw_data_json)
+        self.status_label.config(text="Données brutes copiées dans le presse-papiers.")
+
     def _create_translation_tab(self):
         self.translation_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.translation_frame, text="🌐 Traduction")
@@ -300,6 +331,44 @@ class MainWindow:
         filename = filedialog.askopenfilename(title="Sélectionner un fichier PDF", filetypes=[("Fichiers PDF", "*.pdf")])
         if filename: self.file_path_var.set(filename)
 
+    def _stream_text(self, widget, text: str, on_done=None):
+        # Remplace le contenu du widget par tranches, une par cycle d'inactivité : la fenêtre reste
+        # réactive pendant le chargement d'un grand XLIFF au lieu de se figer sur un seul insert().
+        # Un nouvel appel sur le même widget remplace le flux en cours, dont les rappels restants
+        # sont ignorés. Le widget reste en lecture seule jusqu'à la dernière tranche, puis on_done est appelé.
+        # L'appelant laisse l'état "traitement en cours" au flux : on_done le lève en cas de succès,
+        # le flux lui-même le lève s'il échoue ou s'il est abandonné.
+        token = object()
+        self._text_streams[str(widget)] = token
+        self._stream_text_chunk(widget, text, 0, token, on_done)
+
+    def _stream_text_chunk(self, widget, text: str, pos: int, token, on_done):
+        key = str(widget)
+        if self._text_streams.get(key) is not token:
+            # Flux remplacé par un appel plus récent : si celui-ci est déjà terminé (ou a échoué),
+            # plus personne ne lèvera l'état de traitement à notre place.
+            if key not in self._text_streams: self._set_processing(False)
+            return
+        try:
+            end = pos + TEXT_STREAM_CHUNK_CHARS
+            widget.config(state='normal')
+            if pos == 0: widget.delete('1.0', tk.END)
+            widget.insert(tk.END, text[pos:end])
+            if end < len(text):
+                widget.config(state='disabled')
+                self.root.after_idle(self._stream_text_chunk, widget, text, end, token, on_done)
+                return
+        except Exception as e:
+            self.logger.error(f"Erreur lors du chargement du texte dans l'interface: {e}", exc_info=True)
+            del self._text_streams[key]
+            try: widget.config(state='normal')
+            except tk.TclError: pass
+            self._set_processing(False)
+            messagebox.showerror("Erreur", f"Le texte n'a pas pu être chargé entièrement : {e}", parent=self.root)
+            return
+        del self._text_streams[key]
+        if on_done: on_done()
+
     def _set_processing(self, is_processing, status_text=""):
         self.processing = is_processing
         if is_processing:
@@ -310,11 +379,14 @@ class MainWindow:
             self.processing_indicator.stop()
 
     def _setup_debug_logger(self, session_id: str):
-        session_dir = self.session_manager.get_session_directory(session_id)
+        session_dir = self._session_dir
         if session_dir:
             handler = logging.FileHandler(session_dir / "debug_session_trace.log", mode='w', encoding='utf-8')
-            handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s'))
-            if self.debug_logger.hasHandlers(): self.debug_logger.handlers.clear()
+            handler.setFormatter(_DEBUG_TRACE_FORMATTER)
+            # Les handlers de la session précédente sont fermés, pas seulement détachés (descripteur ouvert sinon)
+            for old_handler in list(self.debug_logger.handlers):
+                self.debug_logger.removeHandler(old_handler)
+                old_handler.close()
             self.debug_logger.addHandler(handler)
             self.debug_logger.setLevel(logging.INFO)
             self.debug_logger.propagate = False
@@ -326,6 +398,7 @@ class MainWindow:
         try:
             session_id = self.session_manager.create_session(Path(pdf_path))
             self.current_session_id = session_id
+            self._session_dir = self.session_manager.get_session_directory(session_id)
             self._setup_debug_logger(session_id)
             self.session_label.config(text=f"Session: {Path(pdf_path).name}")
             self.notebook.hide(self.ai_frame)
@@ -344,19 +417,24 @@ class MainWindow:
                     pdf_path = Path(session_info.original_pdf_path)
                     
                     self.raw_page_objects = self.pdf_analyzer.analyze_pdf_raw_blocks(pdf_path)
-                    raw_data_json = json.dumps([asdict(p) for p in self.raw_page_objects], indent=2)
+                    raw_data_json = json.dumps([p.to_dict() for p in self.raw_page_objects], indent=2)
                     
-                    session_dir = self.session_manager.get_session_directory(self.current_session_id)
-                    with open(session_dir / "0_raw_analysis.json", "w", encoding="utf-8") as f:
-                        f.write(raw_data_json)
+                    session_dir = self._session_dir
+                    FileUtils.write_text(session_dir / "0_raw_analysis.json", raw_data_json)
                     self.debug_logger.info("Fichier de débogage '0_raw_analysis.json' sauvegardé.")
 
                     def update_ui_for_ai():
                         # Utiliser l'objet frame (self.ai_frame) pour le montrer, pas l'index
                         self.notebook.add(self.ai_frame)
                         self.notebook.select(self.ai_frame)
+                        # Le widget Text met en page chaque caractère inséré : seul un aperçu y est chargé,
+                        # le JSON complet reste disponible via le bouton de copie et le fichier 0.
+                        self._raw_data_json = raw_data_json
                         self.ai_input_text.delete('1.0', tk.END)
-                        self.ai_input_text.insert('1.0', raw_data_json)
+                        if len(raw_data_json) > AI_INPUT_PREVIEW_CHARS:
+                            self.ai_input_text.insert('1.0', raw_data_json[:AI_INPUT_PREVIEW_CHARS] + "\n\n… (aperçu tronqué — utilisez « Copier les Données Complètes »)")
+                        else:
+                            self.ai_input_text.insert('1.0', raw_data_json)
                         self.ai_output_text.delete('1.0', tk.END)
                         messagebox.showinfo("Action requise", "Les données brutes ont été extraites. Allez dans l'onglet 'Interaction IA' pour continuer.", parent=self.root)
                     
@@ -373,9 +451,10 @@ class MainWindow:
                     session_info = self.session_manager.get_session_info(self.current_session_id)
                     pdf_path = Path(session_info.original_pdf_path)
                     page_objects = self.pdf_analyzer.analyze_pdf(pdf_path)
-                    session_dir = self.session_manager.get_session_directory(self.current_session_id)
+                    session_dir = self._session_dir
                     dom_path = session_dir / "1_dom_analysis.json"
-                    with open(dom_path, "w", encoding="utf-8") as f: json.dump([asdict(p) for p in page_objects], f, indent=2)
+                    _write_json(dom_path, [p.to_dict() for p in page_objects])
+                    self._current_page_objects = (self.current_session_id, page_objects)
                     self.debug_logger.info("Fichier de débogage '1_dom_analysis.json' sauvegardé.")
                     self.root.after(0, self._post_analysis_step, page_objects)
                 except Exception as e:
@@ -403,10 +482,10 @@ class MainWindow:
                     self.raw_page_objects, instructions
                 )
                 
-                session_dir = self.session_manager.get_session_directory(self.current_session_id)
+                session_dir = self._session_dir
                 dom_path = session_dir / "1_dom_analysis.json"
-                with open(dom_path, "w", encoding="utf-8") as f:
-                    json.dump([asdict(p) for p in semantically_grouped_pages], f, indent=2)
+                _write_json(dom_path, [p.to_dict() for p in semantically_grouped_pages])
+                self._current_page_objects = (self.current_session_id, semantically_grouped_pages)
                 self.debug_logger.info("Fichier '1_dom_analysis.json' construit par le programme à partir des instructions de l'IA.")
 
                 self.root.after(0, self._post_ai_processing, semantically_grouped_pages)
@@ -424,37 +503,48 @@ class MainWindow:
     
     def _post_ai_processing(self, grouped_pages: List[PageObject]):
         self._set_processing(True, "Génération des fichiers de traduction...")
+        loading = False
         try:
             extraction_result = self.text_extractor.create_xliff(grouped_pages, self.source_lang_var.get(), self.target_lang_var.get())
             xliff_content = extraction_result["xliff"]
             styles = extraction_result["styles"]
-            session_dir = self.session_manager.get_session_directory(self.current_session_id)
+            session_dir = self._session_dir
             
-            with open(session_dir / "2_xliff_to_translate.xliff", "w", encoding="utf-8") as f: f.write(xliff_content)
-            with open(session_dir / "styles.json", "w", encoding="utf-8") as f: json.dump(styles, f, indent=2)
+            FileUtils.write_bytes(session_dir / "2_xliff_to_translate.xliff", xliff_content)
+            _write_json(session_dir / "styles.json", styles)
             self.debug_logger.info("Fichiers XLIFF et styles générés après traitement IA.")
             
             self.notebook.hide(self.ai_frame)
             self.notebook.select(self.translation_frame)
-            self.translation_input.delete('1.0', tk.END)
-            self.translation_input.insert('1.0', xliff_content)
             self.open_export_folder_button.config(state='normal')
-            messagebox.showinfo("Succès", "La structure sémantique a été appliquée.\nLe fichier XLIFF a été généré et chargé. Vous pouvez maintenant traduire.", parent=self.root)
+
+            def on_loaded():
+                self._set_processing(False)
+                messagebox.showinfo("Succès", "La structure sémantique a été appliquée.\nLe fichier XLIFF a été généré et chargé. Vous pouvez maintenant traduire.", parent=self.root)
+
+            # "Prêt" n'est affiché qu'une fois le XLIFF entièrement chargé dans la zone de traduction
+            self._stream_text(self.translation_input, xliff_content.decode('utf-8'), on_loaded)
+            loading = True
 
         except Exception as e:
             self.logger.error(f"Erreur lors de la post-traitement IA: {e}", exc_info=True)
             messagebox.showerror("Erreur", f"Erreur lors de la génération des fichiers de traduction : {e}", parent=self.root)
         finally:
-             self._set_processing(False)
+            if not loading: self._set_processing(False)
 
     def _post_analysis_step(self, page_objects: List[PageObject]):
-        total_blocks = sum(len(p.text_blocks) for p in page_objects)
-        total_spans = sum(len(para.spans) for p in page_objects for b in p.text_blocks for para in b.paragraphs)
-        summary = f"Analyse terminée.\n- Pages: {len(page_objects)}\n- Blocs de texte: {total_blocks}\n- Segments de style (spans): {total_spans}"
+        # Un seul parcours du DOM pour les compteurs du résumé et les polices requises
+        total_blocks, total_spans = 0, 0
+        required_fonts = set()
+        for page in page_objects:
+            total_blocks += len(page.text_blocks)
+            for block in page.text_blocks:
+                for para in block.paragraphs:
+                    total_spans += len(para.spans)
+                    required_fonts.update(span.font.name for span in para.spans)
+        summary = ANALYSIS_SUMMARY_TEMPLATE.format_map({'pages': len(page_objects), 'blocks': total_blocks, 'spans': total_spans})
         self.analysis_text.config(state='normal'); self.analysis_text.delete('1.0', tk.END); self.analysis_text.insert('1.0', summary); self.analysis_text.config(state='disabled')
         
-        required_fonts = {span.font.name for page in page_objects for block in page.text_blocks for para in block.paragraphs for span in para.spans}
-        
         font_report = self.font_manager.check_fonts_availability(list(required_fonts))
         if not font_report['all_available']:
             FontDialog(self.root, self.font_manager, font_report).show()
@@ -466,17 +556,19 @@ class MainWindow:
         def thread_target():
             self._set_processing(True, "Génération du fichier XLIFF...")
             try:
-                page_objects = self._load_dom_from_file(self.current_session_id, "1_dom_analysis.json")
+                cached_session_id, page_objects = self._current_page_objects
+                if cached_session_id != self.current_session_id:
+                    page_objects = self._load_dom_from_file("1_dom_analysis.json")
                 extraction_result = self.text_extractor.create_xliff(page_objects, self.source_lang_var.get(), self.target_lang_var.get())
                 xliff_content = extraction_result["xliff"]
                 styles = extraction_result["styles"]
-                session_dir = self.session_manager.get_session_directory(self.current_session_id)
+                session_dir = self._session_dir
                 
                 xliff_path = session_dir / "2_xliff_to_translate.xliff"
-                with open(xliff_path, "w", encoding="utf-8") as f: f.write(xliff_content)
+                FileUtils.write_bytes(xliff_path, xliff_content)
                 
                 styles_path = session_dir / "styles.json"
-                with open(styles_path, "w", encoding="utf-8") as f: json.dump(styles, f, indent=2)
+                _write_json(styles_path, styles)
 
                 self.root.after(0, lambda: self.open_export_folder_button.config(state='normal'))
                 self.root.after(0, lambda: messagebox.showinfo("Succès", "Fichiers de traduction créés."))
@@ -491,40 +583,46 @@ class MainWindow:
         if not self.current_session_id: return messagebox.showerror("Erreur", "Aucune session active.")
         def thread_target():
             self._set_processing(True, "Traduction automatique en cours...")
+            loading = False
             try:
-                session_dir = self.session_manager.get_session_directory(self.current_session_id)
+                session_dir = self._session_dir
                 
                 xliff_path = session_dir / "2_xliff_to_translate.xliff"
                 if not xliff_path.exists():
                     self.root.after(0, lambda: messagebox.showerror("Erreur", "Fichier XLIFF non trouvé. Veuillez d'abord générer les fichiers."))
-                    self._set_processing(False)
                     return
                 
-                with open(xliff_path, "r", encoding="utf-8") as f:
-                    xliff_content = f.read()
+                # Lu en octets : le parseur XML décode lui-même, sans copie str intermédiaire
+                xliff_content = xliff_path.read_bytes()
 
                 translated_xliff = self.auto_translator.translate_xliff_content(xliff_content, self.target_lang_var.get())
-                with open(session_dir / "3_xliff_translated.xliff", "w", encoding="utf-8") as f: f.write(translated_xliff)
+                FileUtils.write_bytes(session_dir / "3_xliff_translated.xliff", translated_xliff.encode("utf-8"))
 
-                self.root.after(0, lambda: self.translation_input.delete('1.0', tk.END))
-                self.root.after(0, lambda: self.translation_input.insert('1.0', translated_xliff))
-                self.root.after(0, lambda: messagebox.showinfo("Succès", "Traduction automatique terminée."))
+                def on_loaded():
+                    self._set_processing(False)
+                    messagebox.showinfo("Succès", "Traduction automatique terminée.")
+
+                # "Prêt" n'est affiché qu'une fois le XLIFF traduit entièrement chargé dans la zone de texte
+                self.root.after(0, self._stream_text, self.translation_input, translated_xliff, on_loaded)
+                loading = True
             except Exception as e:
                 self.logger.error(f"Erreur de traduction automatique: {e}", exc_info=True)
                 self.root.after(0, lambda e=e: messagebox.showerror("Erreur de Traduction", str(e)))
             finally:
-                self._set_processing(False)
+                if not loading: self._set_processing(False)
         threading.Thread(target=thread_target, daemon=True).start()
 
     def _validate_translation(self):
+        if str(self.translation_input) in self._text_streams:
+            return messagebox.showwarning("Attention", "Le XLIFF est encore en cours de chargement. Veuillez patienter.")
         xliff_content = self.translation_input.get('1.0', tk.END).strip()
         if not xliff_content: return messagebox.showwarning("Attention", "Le champ de traduction est vide.")
         def thread_target():
             self._set_processing(True, "Importation des traductions...")
             try:
                 translations = self.translation_parser.parse_xliff(xliff_content)
-                session_dir = self.session_manager.get_session_directory(self.current_session_id)
-                with open(session_dir / "4_parsed_translations.json", "w", encoding="utf-8") as f: json.dump(translations, f, indent=2)
+                session_dir = self._session_dir
+                _write_json(session_dir / "4_parsed_translations.json", translations)
                 self.debug_logger.info(f"Fichier de débogage '4_parsed_translations.json' sauvegardé.")
                 self.root.after(0, lambda: self.continue_to_layout_button.config(state='normal'))
                 self.root.after(0, lambda: messagebox.showinfo("Succès", f"{len(translations)} traductions importées."))
@@ -539,18 +637,16 @@ class MainWindow:
         def thread_target():
             self._set_processing(True, "Calcul de la mise en page...")
             try:
-                session_dir = self.session_manager.get_session_directory(self.current_session_id)
-                page_objects = self._load_dom_from_file(self.current_session_id, "1_dom_analysis.json")
-                with open(session_dir / "4_parsed_translations.json", "r", encoding="utf-8") as f:
-                    translations = json.load(f)
+                session_dir = self._session_dir
+                page_objects = self._load_dom_from_file("1_dom_analysis.json")
+                translations = json.loads((session_dir / "4_parsed_translations.json").read_bytes())
                 
                 self.debug_logger.info("Injection des traductions dans le DOM avant le layout...")
                 self._prepare_render_version(page_objects, translations)
                 
                 final_pages = self.layout_processor.process_pages(page_objects)
                 
-                with open(session_dir / "5_final_layout.json", "w", encoding="utf-8") as f: 
-                    json.dump([asdict(p) for p in final_pages], f, indent=2)
+                _write_json(session_dir / "5_final_layout.json", [p.to_dict() for p in final_pages])
                 self.debug_logger.info("Fichier de débogage '5_final_layout.json' sauvegardé.")
                 
                 self.root.after(0, lambda: self.layout_results_text.config(state='normal'))
@@ -574,18 +670,22 @@ class MainWindow:
         for span in span_map.values():
             span.text = ""
 
+        # Un seul parseur HTML pour tous les paragraphes (au lieu d'un par paragraphe).
+        parser = etree.HTMLParser()
+
         for para_id, translated_html in translations.items():
-            if not translated_html or not translated_html.strip():
+            # Un seul strip() par paragraphe, réutilisé pour tous les tests suivants.
+            translated_html = translated_html.strip() if translated_html else ""
+            if not translated_html:
                 continue
 
             try:
-                if translated_html.strip().startswith('<![CDATA['):
-                    translated_html = translated_html.strip()[9:-3]
-                
-                parser = etree.HTMLParser()
-                root = etree.fromstring(f"<div>{translated_html.strip()}</div>", parser)
+                if translated_html.startswith('<![CDATA['):
+                    translated_html = translated_html[9:-3].strip()
+
+                root = etree.fromstring(f"<div>{translated_html}</div>", parser)
                 
-                translated_spans = root.xpath('.//span[@id]')
+                translated_spans = _TRANSLATED_SPANS_XPATH(root)
                 if not translated_spans:
                     self.debug_logger.warning(f"  ! Aucun span avec ID trouvé dans la traduction pour le paragraphe {para_id}")
                     continue
@@ -611,7 +711,7 @@ class MainWindow:
         def thread_target():
             self._set_processing(True, "Génération du PDF final...")
             try:
-                final_pages = self._load_dom_from_file(self.current_session_id, "5_final_layout.json")
+                final_pages = self._load_dom_from_file("5_final_layout.json")
                 
                 session_info = self.session_manager.get_session_info(self.current_session_id)
                 original_pdf_path = Path(session_info.original_pdf_path)
@@ -627,12 +727,10 @@ class MainWindow:
                 self._set_processing(False)
         threading.Thread(target=thread_target, daemon=True).start()
 
-    def _load_dom_from_file(self, session_id: str, filename: str) -> List[PageObject]:
-        session_dir = self.session_manager.get_session_directory(session_id)
-        file_path = session_dir / filename
+    def _load_dom_from_file(self, filename: str) -> List[PageObject]:
+        file_path = self._session_dir / filename
         self.debug_logger.info(f"--- Démarrage de _load_dom_from_file (v2.2 Robuste) pour '{filename}' ---")
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = json.loads(file_path.read_bytes())
 
         pages = []
         for page_data in data:
@@ -700,7 +798,7 @@ class MainWindow:
 
     def _open_session_folder(self):
         if self.current_session_id:
-            session_dir = self.session_manager.get_session_directory(self.current_session_id)
+            session_dir = self._session_dir
             if session_dir and session_dir.exists(): os.startfile(session_dir)
 
     def _open_output_folder(self):
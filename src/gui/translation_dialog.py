@@ -14,11 +14,13 @@ import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import json
-import re
 
 # Imports des modules core
 from core.translation_parser import TranslationParser, ValidationLevel, ParseResult
 
+# Puces reconnues en début de texte (après d'éventuels blancs) : simple test d'appartenance
+_LIST_BULLETS = frozenset('•·‣⁃-*+')
+
 class TranslationDialog:
     """Interface avancée de gestion des traductions"""
     
@@ -365,8 +367,9 @@ Pages: {session_info['total_pages']} | Éléments à traduire: {session_info['tr
     def _update_statistics(self):
         """Met à jour les statistiques affichées"""
         total = len(self.original_elements)
-        translated = len([t for t in self.translations.values() if t.strip()])
-        valid = len([v for v in self.validation_results.values() if v['is_valid']])
+        # Comptages en un passage, sans liste intermédiaire
+        translated = sum(1 for t in self.translations.values() if t.strip())
+        valid = sum(1 for v in self.validation_results.values() if v['is_valid'])
         
         # Progression
         if total > 0:
@@ -381,6 +384,10 @@ Pages: {session_info['total_pages']} | Éléments à traduire: {session_info['tr
     def _apply_filter(self):
         """Applique le filtre sélectionné"""
         filter_value = self.filter_var.get()
+        # Ensembles calculés une fois par filtrage, puis simple test d'appartenance par ligne
+        translated_ids = {element_id for element_id, text in self.translations.items() if text.strip()}
+        invalid_ids = {element_id for element_id, validation in self.validation_results.items() if not validation['is_valid']}
+        search_query = self.search_query.lower()
         
         # Masquer/afficher les éléments selon le filtre
         for item in self.elements_tree.get_children():
@@ -388,19 +395,18 @@ Pages: {session_info['total_pages']} | Éléments à traduire: {session_info['tr
             show_item = True
             
             if filter_value == "missing":
-                show_item = element_id not in self.translations or not self.translations[element_id].strip()
+                show_item = element_id not in translated_ids
             elif filter_value == "translated":
-                show_item = element_id in self.translations and self.translations[element_id].strip()
+                show_item = element_id in translated_ids
             elif filter_value == "issues":
-                show_item = (element_id in self.validation_results and 
-                           not self.validation_results[element_id]['is_valid'])
+                show_item = element_id in invalid_ids
             # "all" ne filtre rien
             
             # Appliquer le filtre de recherche aussi
-            if show_item and self.search_query:
+            if show_item and search_query:
                 element = self.original_elements[element_id]
                 search_text = f"{element['original_text']} {element['content_type']}".lower()
-                show_item = self.search_query.lower() in search_text
+                show_item = search_query in search_text
             
             # Masquer/afficher l'élément
             if show_item:
@@ -537,8 +543,8 @@ Notes: {element['notes'] if element['notes'] else 'Aucune'}"""
         
         # Vérifier les caractères spéciaux pour les listes
         if original_element['content_type'] == 'list_item':
-            original_has_bullet = bool(re.search(r'^[\s]*[•·‣⁃\-\*\+]', original_element['original_text']))
-            translated_has_bullet = bool(re.search(r'^[\s]*[•·‣⁃\-\*\+]', translated_text))
+            original_has_bullet = original_element['original_text'].lstrip()[:1] in _LIST_BULLETS
+            translated_has_bullet = translated_text.lstrip()[:1] in _LIST_BULLETS
             
             if original_has_bullet != translated_has_bullet:
                 issues.append("Structure de liste modifiée")
@@ -725,7 +731,7 @@ Le format doit contenir les identifiants [ID:XXX|...] suivis du texte traduit.""
                     'validation_results': self.validation_results,
                     'export_date': datetime.now().isoformat(),
                     'total_elements': len(self.original_elements),
-                    'translated_elements': len([t for t in self.translations.values() if t.strip()])
+                    'translated_elements': sum(1 for t in self.translations.values() if t.strip())
                 }
                 
                 with open(filename, 'w', encoding='utf-8') as f:
@@ -832,8 +838,8 @@ Le format doit contenir les identifiants [ID:XXX|...] suivis du texte traduit.""
     def _validate_and_close(self):
         """Valide tout et ferme la fenêtre"""
         # Vérifier que toutes les traductions sont présentes
-        missing_count = len([e for e in self.original_elements 
-                           if e not in self.translations or not self.translations[e].strip()])
+        missing_count = sum(1 for e in self.original_elements 
+                            if e not in self.translations or not self.translations[e].strip())
         
         if missing_count > 0:
             result = messagebox.askyesno("Traductions Manquantes", 
@@ -910,8 +916,8 @@ RACCOURCIS:
     def get_statistics(self) -> Dict[str, int]:
         """Retourne les statistiques"""
         total = len(self.original_elements)
-        translated = len([t for t in self.translations.values() if t.strip()])
-        valid = len([v for v in self.validation_results.values() if v['is_valid']])
+        translated = sum(1 for t in self.translations.values() if t.strip())
+        valid = sum(1 for v in self.validation_results.values() if v['is_valid'])
         
         return {
             'total_elements': total,
@@ -106,6 +106,40 @@ class FileUtils:
         except Exception:
             return ""
     
+    @staticmethod
+    def write_bytes(file_path: Path, data: bytes):
+        """
+        Écrit un contenu complet en une seule passe sur le descripteur brut
+        (pas de TextIOWrapper ni de découpage en blocs de 8 Kio)
+        
+        Args:
+            file_path: Chemin du fichier (créé ou écrasé)
+            data: Contenu à écrire
+        """
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+        fd = os.open(file_path, flags, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            os.close(fd)
+    
+    @staticmethod
+    def write_text(file_path: Path, text: str):
+        """
+        Écrit un texte en UTF-8 en un seul appel, avec les fins de ligne natives
+        (mêmes octets qu'un open(..., 'w', encoding='utf-8') en mode texte)
+        
+        Args:
+            file_path: Chemin du fichier (créé ou écrasé)
+            text: Texte à écrire
+        """
+        if os.linesep != '\n':
+            text = text.replace('\n', os.linesep)
+        FileUtils.write_bytes(file_path, text.encode('utf-8'))
+    
     def create_safe_filename(self, base_name: str, extension: str = "") -> str:
         """
         Crée un nom de fichier sécurisé
@@ -307,12 +341,12 @@ class FileUtils:
             for page_num in range(min(5, len(doc))):  # Vérifier les 5 premières pages max
                 page = doc[page_num]
                 
-                # Vérifier le texte
-                if page.get_text().strip():
+                # Vérifier le texte (inutile de ré-extraire une fois trouvé)
+                if not has_text and page.get_text().strip():
                     has_text = True
                 
-                # Vérifier les images
-                if page.get_images():
+                # Vérifier les images (get_images() parcourt le dictionnaire de ressources)
+                if not has_images and page.get_images():
                     has_images = True
                 
                 if has_text and has_images:
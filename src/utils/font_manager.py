@@ -23,6 +23,10 @@ class FontManager:
         
         self.system_fonts: Dict[str, Path] = {}
         self.font_mappings: Dict[str, str] = {}
+        # Liste triée des polices, calculée à la première demande et invalidée à chaque scan
+        self._sorted_fonts: Optional[List[str]] = None
+        # Rapports de disponibilité par ensemble de polices requises (ne dépendent que du scan)
+        self._availability_cache: Dict[frozenset, Dict[str, Any]] = {}
         
         self._scan_system_fonts()
         self._load_font_mappings()
@@ -53,6 +57,8 @@ class FontManager:
         
         for path in font_paths:
             self._process_font_file(path)
+        self._sorted_fonts = None
+        self._availability_cache = {}
 
     def _get_system_font_directories(self) -> List[Path]:
         dirs = []
@@ -93,17 +99,35 @@ class FontManager:
                 self.system_fonts[ps_name] = font_path
 
     def get_all_available_fonts(self) -> List[str]:
-        return sorted(list(self.system_fonts.keys()))
+        # Liste partagée entre les appelants : à ne pas modifier
+        if self._sorted_fonts is None:
+            self._sorted_fonts = sorted(self.system_fonts)
+        return self._sorted_fonts
 
     def check_fonts_availability(self, required_fonts: List[str]) -> Dict[str, Any]:
-        missing_fonts = {font for font in set(required_fonts) if font not in self.system_fonts}
+        # Rapport partagé entre les appelants pour un même ensemble de polices : à ne pas modifier
+        key = frozenset(required_fonts)
+        report = self._availability_cache.get(key)
+        if report is None:
+            report = self._availability_cache[key] = self._build_availability_report(key)
+        return report
+
+    def _build_availability_report(self, required_fonts: frozenset) -> Dict[str, Any]:
+        # Différence ensembliste directe avec la vue des clés : pas de seconde copie en set
+        missing_fonts = required_fonts - self.system_fonts.keys()
         suggestions = {font: [{'font_name': "Arial"}] for font in missing_fonts}
-        return {'missing_fonts': sorted(list(missing_fonts)), 'suggestions': suggestions, 'all_available': not missing_fonts}
+        return {'missing_fonts': sorted(missing_fonts), 'suggestions': suggestions, 'all_available': not missing_fonts}
         
     def create_font_mapping(self, original_font: str, replacement_font_name: str):
         self.font_mappings[original_font] = replacement_font_name
         self._save_font_mappings()
 
+    def bulk_create_font_mappings(self, mappings: Dict[str, str]):
+        # Plusieurs correspondances, une seule réécriture du fichier
+        if not mappings: return
+        self.font_mappings.update(mappings)
+        self._save_font_mappings()
+
     def get_font_mapping(self, original_font: str) -> Optional[str]:
         return self.font_mappings.get(original_font)
 